@@ -23,10 +23,11 @@ def generate_zones():
         rows = []
         print(f"\n--- Procesando Departamento: {departamento} ---")
         
-        for _, row in df.iterrows():
-            municipio = str(row["municipio"]).strip()
-            cod_dpto = str(row.get("cod_dpto", "")).strip()
-            cod_mpio = str(row.get("cod_mpio", "")).strip()
+        columnas = df.reindex(columns=["municipio", "cod_dpto", "cod_mpio"], fill_value="")
+        for municipio, cod_dpto, cod_mpio in columnas.itertuples(index=False, name=None):
+            municipio = str(municipio).strip()
+            cod_dpto = str(cod_dpto).strip()
+            cod_mpio = str(cod_mpio).strip()
             
             print(f"Procesando {municipio} (Código: {cod_mpio})...")
 
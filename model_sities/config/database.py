@@ -23,6 +23,7 @@ class MongoDBConfig:
     COLLECTION_REVIEWERS = "reviewers"
     COLLECTION_PROGRESS = "progress"
     COLLECTION_SITIES_STATS = "sities_stats"
+    COLLECTION_PROCESSED_CELLS = "processed_cells"
     
     _client: Optional[MongoClient] = None
     _db = None
@@ -112,16 +113,18 @@ class MongoDBConfig:
             name="idx_module_unique"
         )
         
+        db[cls.COLLECTION_PROCESSED_CELLS].create_index(
+            [("csv_path", ASCENDING), ("url_municipio", ASCENDING)],
+            unique=True,
+            name="idx_csv_url_unique"
+        )
+        
         print("[INFO] Índices de MongoDB creados correctamente.")
     
-    @classmethod
-    def create_materialized_views(cls):
-        """Crea vistas materializadas para estadísticas por municipio."""
-        db = cls._db
-        
-        db[cls.COLLECTION_SITIES_STATS].drop()
-        
-        pipeline = [
+    @staticmethod
+    def _stats_pipeline() -> list:
+        """Etapas de agregación que calculan las estadísticas por municipio."""
+        return [
             {
                 "$group": {
                     "_id": "$municipio",
@@ -146,6 +149,16 @@ class MongoDBConfig:
                     "ultima_actualizacion": 1
                 }
             },
+        ]
+    
+    @classmethod
+    def create_materialized_views(cls):
+        """Crea vistas materializadas para estadísticas por municipio."""
+        db = cls._db
+        
+        db[cls.COLLECTION_SITIES_STATS].drop()
+        
+        pipeline = cls._stats_pipeline() + [
             {
                 "$out": cls.COLLECTION_SITIES_STATS
             }
@@ -160,6 +173,35 @@ class MongoDBConfig:
         
         print("[INFO] Vistas materializadas creadas correctamente.")
     
+    @classmethod
+    def refresh_materialized_views(cls, municipios: list):
+        """
+        Recalcula solo las estadísticas de los municipios indicados y las
+        fusiona en la vista materializada, sin reconstruir el resto.
+        """
+        db = cls._db
+        
+        # $merge por municipio necesita el índice único sobre ese campo
+        db[cls.COLLECTION_SITIES_STATS].create_index(
+            [("municipio", ASCENDING)],
+            unique=True
+        )
+        
+        pipeline = [{"$match": {"municipio": {"$in": municipios}}}]
+        pipeline += cls._stats_pipeline()
+        pipeline.append({
+            "$merge": {
+                "into": cls.COLLECTION_SITIES_STATS,
+                "on": "municipio",
+                "whenMatched": "replace",
+                "whenNotMatched": "insert"
+            }
+        })
+        
+        db[cls.COLLECTION_SITIES].aggregate(pipeline)
+        
+        print(f"[INFO] Estadísticas actualizadas para {len(municipios)} municipio(s).")
+    
     @classmethod
     def close_connection(cls):
         """Cierra la conexión a MongoDB."""
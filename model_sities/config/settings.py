@@ -23,6 +23,7 @@ class Settings:
     
     # Archivos y directorios con rutas absolutas
     COOKIES_JSON = os.path.join(DATA_DIR, "cookies_foursquare.json")
+    STORAGE_STATE_JSON = os.path.join(DATA_DIR, "storage_state_foursquare.json")  # Sesión completa tras el login
     SITIES_OUTPUT_DIR = os.path.join(DATA_DIR, "sities")
     REVIEWS_OUTPUT_DIR = os.path.join(DATA_DIR, "reviewers_sities")
     PROGRESS_SITIES = os.path.join(SITIES_OUTPUT_DIR, "progress_sities.json")
@@ -51,6 +52,9 @@ class Settings:
     # Configuración del navegador
     BROWSER_TYPE = "chromium"  # firefox, chromium, webkit 
     HEADLESS = True # False = firefox con interfaz gráfica, True = sin interfaz gráfica
+    # Recursos que no se descargan; las hojas de estilo se conservan porque
+    # la detección de tarjetas de error depende de is_visible
+    BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
     
     # Tiempos de espera (en milisegundos) basados en tu script de reviews
     # Pausa corta para acciones como paginación o clics secundarios
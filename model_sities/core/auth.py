@@ -5,13 +5,14 @@ from ..utils.cookies_helper import save_cookies, load_cookies
 class FoursquareAuth:
     """Maneja la autenticación en Foursquare"""
 
-    def __init__(self, cookies_path=Settings.COOKIES_JSON):
+    def __init__(self, cookies_path=Settings.COOKIES_JSON, storage_state_path=Settings.STORAGE_STATE_JSON):
         self.cookies_path = cookies_path
+        self.storage_state_path = storage_state_path
 
     def login(self, page: Page) -> bool:
-        """Intenta cargar cookies, si falla hace login manual"""
-        # 1. Intentar cargar cookies
-        if load_cookies(page, self.cookies_path):
+        """Reutiliza la sesión guardada o las cookies; si no son válidas hace login manual"""
+        # 1. El contexto ya trae la sesión guardada (storage_state) o se cargan las cookies
+        if page.context.cookies() or load_cookies(page, self.cookies_path):
             page.goto(Settings.BASE_URL)
             page.wait_for_timeout(Settings.WAIT_SHORT_MIN)
             if "login" not in page.url:
@@ -31,6 +32,8 @@ class FoursquareAuth:
             print("Si se requiere autenticación de dos factores, ingrésala ahora en el navegador")
             page.pause()  # Pausa para 2FA
             save_cookies(page, self.cookies_path)
+            # Las siguientes ejecuciones crean el contexto con esta sesión y no pasan por aquí
+            page.context.storage_state(path=self.storage_state_path)
             print("Proceso de login completado y cookies guardadas.")
             return True
         except Exception as e:
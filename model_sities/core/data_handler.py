@@ -1,7 +1,7 @@
 """Gestión de datos con consultas optimizadas por municipio."""
 
-from typing import Dict, List, Any, Optional
-from pymongo.errors import DuplicateKeyError
+from typing import Dict, List, Any, Optional, Set, Tuple
+from pymongo.errors import BulkWriteError
 
 from ..config.database import MongoDBConfig
 from ..utils.helpers import current_timestamp
@@ -10,6 +10,10 @@ from ..utils.helpers import current_timestamp
 class MongoDataHandler:
     """Manejador de datos con consultas optimizadas."""
     
+    # Documento de la colección de progreso con los municipios cuyas estadísticas
+    # faltan por recalcular; sobrevive a una ejecución interrumpida
+    STATS_PENDING_MODULE = "sities_stats_pendientes"
+    
     def __init__(self):
         self.db = MongoDBConfig.get_database()
         self.sities_collection = self.db[MongoDBConfig.COLLECTION_SITIES]
@@ -18,6 +22,17 @@ class MongoDataHandler:
         ]
         self.progress_collection = self.db[MongoDBConfig.COLLECTION_PROGRESS]
         self.stats_collection = self.db[MongoDBConfig.COLLECTION_SITIES_STATS]
+        self.processed_cells_collection = self.db[
+            MongoDBConfig.COLLECTION_PROCESSED_CELLS
+        ]
+        # URLs de sitios ya enviadas en esta ejecución; las celdas vecinas se solapan
+        self._seen_site_urls: Set[str] = set()
+        # Totales por municipio y por sitio: se cuentan en la base una sola vez
+        # y luego se actualizan con lo insertado en cada lote
+        self._sites_per_municipio: Dict[str, int] = {}
+        self._reviewers_per_site: Dict[str, int] = {}
+        # Municipios con sitios nuevos desde la última actualización de estadísticas
+        self._dirty_municipios: Set[str] = set()
     
     def load_data_sities(self):
         """Carga datos de sitios desde MongoDB."""
@@ -30,6 +45,21 @@ class MongoDataHandler:
         print(f"[INFO] Cargados {total_reviewers} reviewers desde MongoDB.")
     
 
+    @staticmethod
+    def _insert_ignoring_duplicates(collection, docs: List[Dict]) -> Tuple[int, int]:
+        """
+        Inserta los documentos en una sola operación sin orden, de modo que los
+        duplicados no detienen el resto. Devuelve (insertados, duplicados).
+        """
+        try:
+            result = collection.insert_many(docs, ordered=False)
+            return len(result.inserted_ids), 0
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            if any(err.get('code') != 11000 for err in errors):
+                raise
+            return e.details.get('nInserted', 0), len(errors)
+
     def add_sites(self, municipio: str, departamento: str, sites: List[Dict]) -> Dict[str, int]:  # Agregado departamento como parámetro, replicando municipio
         """Añade sitios a MongoDB evitando duplicados."""
         if not sites:
@@ -39,23 +69,43 @@ class MongoDataHandler:
                 'total_items': 0
             }
         
-        new_count = 0
-        duplicates_count = 0
-        
+        fecha = current_timestamp()
+        new_sites = []
+        batch_urls = set()
         for site in sites:
+            url = site.get('url_sitio', '')
+            if url in self._seen_site_urls or url in batch_urls:
+                continue
+            batch_urls.add(url)
             site['municipio'] = municipio
             site['departamento'] = departamento  # Agregado, replicando municipio
-            site['fecha_extraccion'] = current_timestamp()
-            
-            try:
-                self.sities_collection.insert_one(site)
-                new_count += 1
-            except DuplicateKeyError:
-                duplicates_count += 1
+            site['fecha_extraccion'] = fecha
+            new_sites.append(site)
         
-        total_in_db = self.sities_collection.count_documents(
-            {'municipio': municipio}
-        )
+        new_count, duplicates_count = 0, 0
+        if new_sites:
+            new_count, duplicates_count = self._insert_ignoring_duplicates(
+                self.sities_collection, new_sites
+            )
+        # Solo tras insertar: si el insert falla, un reintento no debe saltarse estos sitios
+        self._seen_site_urls |= batch_urls
+        duplicates_count += len(sites) - len(new_sites)
+        if new_count and municipio not in self._dirty_municipios:
+            self._dirty_municipios.add(municipio)
+            self.progress_collection.update_one(
+                {'module': self.STATS_PENDING_MODULE},
+                {'$addToSet': {'municipios': municipio}},
+                upsert=True
+            )
+        
+        total_in_db = self._sites_per_municipio.get(municipio)
+        if total_in_db is None:
+            total_in_db = self.sities_collection.count_documents(
+                {'municipio': municipio}
+            )
+        else:
+            total_in_db += new_count
+        self._sites_per_municipio[municipio] = total_in_db
         
         return {
             'new_sites': new_count,
@@ -152,9 +202,25 @@ class MongoDataHandler:
         """Obtiene lista de todos los municipios únicos."""
         return self.sities_collection.distinct("municipio")
     
-    def refresh_stats(self):
-        """Refresca las estadísticas materializadas."""
-        MongoDBConfig.create_materialized_views()
+    def refresh_stats(self, full: bool = False):
+        """
+        Refresca las estadísticas materializadas de los municipios con sitios
+        nuevos, incluidos los que dejó pendientes una ejecución interrumpida.
+        Con `full`, o si aún no hay estadísticas, las reconstruye todas.
+        """
+        pending = self.progress_collection.find_one(
+            {'module': self.STATS_PENDING_MODULE}
+        ) or {}
+        municipios = self._dirty_municipios | set(pending.get('municipios', []))
+        if full or self.stats_collection.estimated_document_count() == 0:
+            MongoDBConfig.create_materialized_views()
+        elif municipios:
+            MongoDBConfig.refresh_materialized_views(sorted(municipios))
+        else:
+            print("[INFO] Sin sitios nuevos; estadísticas sin cambios.")
+            return
+        self.progress_collection.delete_one({'module': self.STATS_PENDING_MODULE})
+        self._dirty_municipios.clear()
         print("[INFO] Estadísticas actualizadas correctamente.")
     
     def add_reviewers(
@@ -174,29 +240,32 @@ class MongoDataHandler:
         site_id = context.get("site_id", "unknown_id")
         site_name = context.get("site_name", "desconocido")
         
-        new_count = 0
-        duplicates_count = 0
-        
-        for reviewer in reviewers:
-            reviewer_doc = {
+        fecha = current_timestamp()
+        reviewer_docs = [
+            {
                 'user_name': reviewer.get('user_name'),
                 'user_url': reviewer.get('user_url'),
                 'site_id': site_id,
                 'site_name': site_name,
                 'municipio': municipio,
-                'fecha_extraccion': current_timestamp()
+                'fecha_extraccion': fecha
             }
-            
-            try:
-                self.reviewers_collection.insert_one(reviewer_doc)
-                new_count += 1
-            except DuplicateKeyError:
-                duplicates_count += 1
+            for reviewer in reviewers
+        ]
         
-        total_in_db = self.reviewers_collection.count_documents(
-            {'site_id': site_id}
+        new_count, duplicates_count = self._insert_ignoring_duplicates(
+            self.reviewers_collection, reviewer_docs
         )
         
+        total_in_db = self._reviewers_per_site.get(site_id)
+        if total_in_db is None:
+            total_in_db = self.reviewers_collection.count_documents(
+                {'site_id': site_id}
+            )
+        else:
+            total_in_db += new_count
+        self._reviewers_per_site[site_id] = total_in_db
+        
         return {
             'new_reviewers': new_count,
             'duplicates_omitted': duplicates_count,
@@ -287,6 +356,24 @@ class MongoDataHandler:
             upsert=True
         )
     
+    def mark_cell_processed(self, csv_path: str, url_municipio: str) -> None:
+        """Registra una URL de celda como terminada para no repetirla al reanudar."""
+        self.processed_cells_collection.update_one(
+            {'csv_path': csv_path, 'url_municipio': url_municipio},
+            {'$set': {'timestamp': current_timestamp()}},
+            upsert=True
+        )
+    
+    def get_processed_cells(self, csv_path: str) -> Set[str]:
+        """Obtiene las URLs de celdas ya terminadas para un CSV."""
+        return {
+            doc['url_municipio']
+            for doc in self.processed_cells_collection.find(
+                {'csv_path': csv_path},
+                {'_id': 0, 'url_municipio': 1}
+            )
+        }
+    
     def load_progress(
         self,
         module: str,
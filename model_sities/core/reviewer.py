@@ -115,10 +115,13 @@ class ReviewerLogic:
         Extrae los perfiles de usuario de la página actual.
         """
         results: List[Dict[str, str]] = []
-        anchors = page.query_selector_all("span.userName a")
-        for a in anchors:
-            name = (a.inner_text() or "").strip()
-            href = a.get_attribute("href") or ""
+        # Nombre y href de todos los autores en una sola llamada al navegador
+        anchors = page.locator("span.userName a").evaluate_all(
+            "els => els.map(a => [a.innerText, a.getAttribute('href')])"
+        )
+        for name, href in anchors:
+            name = (name or "").strip()
+            href = href or ""
             if href.startswith("/"):
                 href = f"{self.settings.BASE_URL}{href}"
             if name and href:
@@ -1,14 +1,53 @@
 """
 Clase principal para realizar scraping en Foursquare
 """
-import pandas as pd
-import numpy as np
 import time
-from typing import Dict, Any
+import random
+from typing import Dict, Any, Optional
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
 from ..config.settings import Settings
 from ..utils.helpers import current_timestamp
 
+# Recorre todas las tarjetas de sitios en el navegador y devuelve sus textos en una sola llamada,
+# en lugar de varias consultas por sitio. Los selectores llegan desde Settings.SELECTORS.
+_EXTRACT_SITES_JS = """
+({ holder, score, name, category, address }) => Array.from(document.querySelectorAll(holder)).map(el => {
+    const text = sel => { const found = el.querySelector(sel); return found ? found.innerText : null; };
+    const nameEl = el.querySelector(name);
+    const link = nameEl ? nameEl.querySelector('a') : null;
+    return {
+        puntuacion: text(score),
+        nombre: link ? link.innerText : (nameEl ? nameEl.innerText : null),
+        href: link ? link.getAttribute('href') : null,
+        categoria: text(category),
+        direccion: text(address),
+    };
+})
+"""
+
+# Selectores compuestos una sola vez al importar el módulo, no por tarea ni por página
+_EARLY_EXIT_SELECTOR = (
+    f"{Settings.SELECTORS['content_holder']}, {Settings.SELECTORS['no_results_card']}, "
+    f"{Settings.SELECTORS['generic_error_card']}"
+)
+_SITE_SELECTORS = {
+    'holder': Settings.SELECTORS['content_holder'],
+    'score': Settings.SELECTORS['venue_score'],
+    'name': Settings.SELECTORS['venue_name'],
+    'category': Settings.SELECTORS['venue_category'],
+    'address': Settings.SELECTORS['venue_address'],
+}
+
+# Valores por defecto de cada sitio; se copia por tarjeta en lugar de armar el dict completo
+_SITIO_TEMPLATE = {
+    "id": "N/A",
+    "puntuacion": "N/A",
+    "nombre": "N/A",
+    "categoria": "N/A",
+    "direccion": "N/A",
+    "url_sitio": "",
+}
+
 class SitiesLogic:
     """Realiza el scraping de sitios turísticos en Foursquare"""
 
@@ -64,13 +103,10 @@ class SitiesLogic:
         """
         Espera la carga de contenido y verifica condiciones de salida temprana.
         """
-        content_selector = self.settings.SELECTORS['content_holder']
         no_results_selector = self.settings.SELECTORS['no_results_card']
         generic_error_selector = self.settings.SELECTORS['generic_error_card']
 
-        page.locator(
-            f"{content_selector}, {no_results_selector}, {generic_error_selector}"
-        ).first.wait_for(timeout=20000)
+        page.locator(_EARLY_EXIT_SELECTOR).first.wait_for(timeout=20000)
 
         if page.is_visible(generic_error_selector):
             print(f"[BLOCK] Bloqueo del servidor detectado en {municipio}.")
@@ -85,12 +121,12 @@ class SitiesLogic:
         Realiza el scraping de los sitios turísticos listados en la página.
         """
         self._load_all_results(page)
-        content_selector = self.settings.SELECTORS['content_holder']
-        sitios_elements = page.query_selector_all(content_selector)
+        sitios_raw = page.evaluate(_EXTRACT_SITES_JS, _SITE_SELECTORS)
+        fecha = current_timestamp()
         sitios_list = []
-        for sitio_element in sitios_elements:
+        for sitio_raw in sitios_raw:
             try:
-                site_data = self._extract_site_data(sitio_element)
+                site_data = self._extract_site_data(sitio_raw, fecha)
                 if site_data.get("id") != "N/A":
                     sitios_list.append(site_data)
             except Exception as e:
@@ -99,66 +135,53 @@ class SitiesLogic:
 
     def _load_all_results(self, page: Page) -> None:
         """Hace clic en 'Ver más resultados' hasta que no haya más"""
-        rng = np.random.default_rng(42)
         try:
             while True:
                 boton = page.query_selector(self.settings.SELECTORS['more_results_button'])
                 if boton and boton.is_visible():
                     boton.click()
                     page.wait_for_timeout(
-                        int(rng.uniform(self.settings.WAIT_SHORT_MIN, self.settings.WAIT_SHORT_MAX))
+                        random.randint(self.settings.WAIT_SHORT_MIN, self.settings.WAIT_SHORT_MAX)
                     )
                 else:
                     break
         except Exception as e:
             print(f"[ERROR] Error al cargar más resultados: {e}")
 
-    def _extract_site_data(self, sitio) -> Dict[str, Any]:
-        """Extrae datos de un sitio individual, usando el ID de la URL."""
-        sitio_data = {
-            "id": "N/A",
-            "puntuacion": "N/A",
-            "nombre": "N/A",
-            "categoria": "N/A",
-            "direccion": "N/A",
-            "url_sitio": "",
-            "fecha_extraccion": current_timestamp()
-        }
+    def _extract_site_data(self, sitio: Dict[str, Any], fecha: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Arma los datos de un sitio a partir de los textos extraídos del DOM, usando el ID de la URL.
+        `fecha` se calcula una vez por página; si no se pasa, se toma la hora actual.
+        """
+        sitio_data = _SITIO_TEMPLATE.copy()
+        sitio_data["fecha_extraccion"] = fecha or current_timestamp()
 
         self._extract_nombre_y_url(sitio, sitio_data)
 
-        puntuacion_element = sitio.query_selector(self.settings.SELECTORS['venue_score'])
-        if puntuacion_element:
-            sitio_data["puntuacion"] = puntuacion_element.inner_text().strip()
+        if sitio.get("puntuacion") is not None:
+            sitio_data["puntuacion"] = sitio["puntuacion"].strip()
 
-        categoria_element = sitio.query_selector(self.settings.SELECTORS['venue_category'])
-        if categoria_element:
-            sitio_data["categoria"] = categoria_element.inner_text().strip().replace('•', '').strip()
+        if sitio.get("categoria") is not None:
+            sitio_data["categoria"] = sitio["categoria"].strip().replace('•', '').strip()
 
-        direccion_element = sitio.query_selector(self.settings.SELECTORS['venue_address'])
-        if direccion_element:
-            sitio_data["direccion"] = direccion_element.inner_text().strip()
+        if sitio.get("direccion") is not None:
+            sitio_data["direccion"] = sitio["direccion"].strip()
 
         return sitio_data
 
-    def _extract_nombre_y_url(self, sitio, sitio_data: Dict[str, Any]) -> None:
+    def _extract_nombre_y_url(self, sitio: Dict[str, Any], sitio_data: Dict[str, Any]) -> None:
         """Extrae el nombre y la URL del sitio, y el ID si es posible."""
-        nombre_element = sitio.query_selector(self.settings.SELECTORS['venue_name'])
-        if not nombre_element:
+        if sitio.get("nombre") is None:
             return
 
-        nombre_link = nombre_element.query_selector('a')
-        if nombre_link:
-            sitio_data["nombre"] = nombre_link.inner_text().strip()
-            href = nombre_link.get_attribute('href')
-            if href:
-                full_url = (
-                    f"{self.settings.BASE_URL}{href}" if href.startswith('/') else href
-                )
-                sitio_data["url_sitio"] = full_url
-                try:
-                    sitio_data["id"] = full_url.strip('/').split('/')[-1]
-                except IndexError:
-                    sitio_data["id"] = "N/A"
-        else:
-            sitio_data["nombre"] = nombre_element.inner_text().strip()
\ No newline at end of file
+        sitio_data["nombre"] = sitio["nombre"].strip()
+        href = sitio.get("href")
+        if href:
+            full_url = (
+                f"{self.settings.BASE_URL}{href}" if href.startswith('/') else href
+            )
+            sitio_data["url_sitio"] = full_url
+            try:
+                sitio_data["id"] = full_url.strip('/').split('/')[-1]
+            except IndexError:
+                sitio_data["id"] = "N/A"
\ No newline at end of file
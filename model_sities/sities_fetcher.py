@@ -3,17 +3,18 @@ Orquestador principal para la extracción de sitios turísticos.
 Versión actualizada con MongoDB Atlas y soporte para directorios.
 """
 import os
+import queue
 import signal
 import argparse
 import pandas as pd
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 
 from .config.settings import Settings
 from .core.data_handler import MongoDataHandler
 from .utils.helpers import print_progress
-from .utils.worker_helper import worker_sities, shutdown_event
+from .utils.worker_helper import worker_sities_batch, shutdown_event
 
 
 class SitiesFetcher:
@@ -47,7 +48,8 @@ class SitiesFetcher:
         self,
         csv_path: str,
         start_index: int = 0,
-        end_index: Optional[int] = None
+        end_index: Optional[int] = None,
+        full_stats: bool = False
     ) -> None:
         """Ejecuta el scraping para uno o múltiples CSVs."""
         csv_files = self._get_csv_files(csv_path)
@@ -60,7 +62,7 @@ class SitiesFetcher:
             print(f"\n[INFO] Procesando archivo: {os.path.basename(csv_file)}")
             self._process_single_csv(csv_file, start_index, end_index)
 
-        self._finalize_data()
+        self._finalize_data(full_stats)
 
     def _process_single_csv(
         self,
@@ -69,14 +71,28 @@ class SitiesFetcher:
         end_index: Optional[int] = None
     ) -> None:
         """
-        Procesa un CSV usando un patrón robusto con as_completed para
-        evitar bloqueos y manejar timeouts individuales.
+        Procesa un CSV repartiendo las tareas en bloques, uno por hilo. Cada
+        hilo reutiliza un único navegador y un único login para todo su bloque
+        y publica los resultados en una cola que consume este hilo.
         """
         self._load_initial_data()
-        resume_index = self._get_resume_index(csv_path, start_index)
 
         df_urls = pd.read_csv(csv_path)
-        df_to_process = df_urls.iloc[resume_index:end_index]
+        processed_cells = self.data_handler.get_processed_cells(
+            os.path.basename(csv_path)
+        )
+        if processed_cells:
+            # Con bloques intercalados entre hilos, el último índice guardado puede
+            # quedar por delante de celdas sin terminar; se reanuda solo por las
+            # celdas ya procesadas en ejecuciones anteriores
+            df_to_process = df_urls.iloc[start_index:end_index]
+            df_to_process = df_to_process[
+                ~df_to_process['url_municipio'].isin(processed_cells)
+            ]
+            print(f"[RESUME] {len(processed_cells)} celdas ya procesadas se omiten.")
+        else:
+            resume_index = self._get_resume_index(csv_path, start_index)
+            df_to_process = df_urls.iloc[resume_index:end_index]
         tasks = df_to_process[
             ['municipio', 'departamento', 'url_municipio']
         ].to_dict('records')
@@ -89,26 +105,43 @@ class SitiesFetcher:
         print(f"[INFO] {total_tasks} tareas para procesar.")
         completed_count = 0
 
-        with ThreadPoolExecutor(
-            max_workers=self.settings.PARALLEL_PROCESSES
-        ) as executor:
-            future_to_task = {
-                executor.submit(worker_sities, task): (i + resume_index, task)
-                for i, task in enumerate(tasks)
-            }
-
-            for future in as_completed(future_to_task):
+        num_workers = min(self.settings.PARALLEL_PROCESSES, total_tasks)
+        # Cada tarea conserva su fila del CSV aunque se hayan omitido celdas
+        indexed_tasks = list(zip(df_to_process.index.tolist(), tasks))
+        results = queue.Queue()
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = [
+                executor.submit(
+                    worker_sities_batch,
+                    indexed_tasks[worker_idx::num_workers],
+                    results
+                )
+                for worker_idx in range(num_workers)
+            ]
+
+            while completed_count < total_tasks:
+                try:
+                    current_index, task_info, result = results.get(timeout=1)
+                except queue.Empty:
+                    # Si todos los hilos terminaron y la cola está vacía, alguno
+                    # falló sin publicar su bloque y no llegarán más resultados
+                    if all(future.done() for future in futures):
+                        break
+                    continue
                 if shutdown_event.is_set():
                     break
 
-                current_index, task_info = future_to_task[future]
                 try:
-                    result = future.result(timeout=600)
                     self._handle_result(result)
                     # Guardar progreso después de un manejo exitoso
                     self.data_handler.save_progress(
                         'sities', os.path.basename(csv_path), current_index
                     )
+                    if result.get("status") in ("success", "no_results"):
+                        self.data_handler.mark_cell_processed(
+                            os.path.basename(csv_path), task_info['url_municipio']
+                        )
                 except Exception as exc:
                     print(
                         f"\n[ERROR] Tarea para {task_info['municipio']} "
@@ -120,6 +153,15 @@ class SitiesFetcher:
                         completed_count, total_tasks, "Procesando"
                     )
 
+        for future in futures:
+            if future.exception() is not None:
+                print(f"\n[ERROR] Un hilo terminó con error: {future.exception()}")
+        if completed_count < total_tasks and not shutdown_event.is_set():
+            print(
+                f"\n[WARN] {total_tasks - completed_count} tareas quedaron "
+                "sin resultado."
+            )
+
     def _load_initial_data(self) -> None:
         """Carga datos iniciales de MongoDB."""
         self.data_handler.load_data_sities()
@@ -158,10 +200,10 @@ class SitiesFetcher:
         else:
             print(f"\n[WARN] {municipio}: Tarea finalizada con estado '{status}'.")
 
-    def _finalize_data(self) -> None:
+    def _finalize_data(self, full_stats: bool = False) -> None:
         """Finaliza y guarda datos pendientes."""
         print("\n[FINALIZE] Finalizando proceso y actualizando estadísticas.")
-        self.data_handler.refresh_stats()
+        self.data_handler.refresh_stats(full=full_stats)
 
 
 def main() -> None:
@@ -179,12 +221,17 @@ def main() -> None:
     parser.add_argument(
         '--end', type=int, default=None, help='Índice final (opcional).'
     )
+    parser.add_argument(
+        '--full-stats', action='store_true',
+        help='Reconstruye todas las estadísticas en lugar de solo las de municipios con sitios nuevos.'
+    )
     args = parser.parse_args()
 
     try:
         fetcher = SitiesFetcher()
         fetcher.run(
-            csv_path=args.csv, start_index=args.start, end_index=args.end
+            csv_path=args.csv, start_index=args.start, end_index=args.end,
+            full_stats=args.full_stats
         )
     except KeyboardInterrupt:
         print("\n[INTERRUPTED] Proceso interrumpido por el usuario.")
@@ -0,0 +1,26 @@
+import unittest
+from unittest.mock import MagicMock
+from pymongo.errors import BulkWriteError
+from model_sities.core.data_handler import MongoDataHandler
+
+class TestInsertIgnoringDuplicates(unittest.TestCase):
+    def test_duplicate_key_errors_are_counted(self):
+        collection = MagicMock()
+        collection.insert_many.side_effect = BulkWriteError({
+            "nInserted": 2,
+            "writeErrors": [{"code": 11000}]
+        })
+        result = MongoDataHandler._insert_ignoring_duplicates(collection, [{}, {}, {}])
+        self.assertEqual(result, (2, 1))
+
+    def test_other_write_errors_are_raised(self):
+        collection = MagicMock()
+        collection.insert_many.side_effect = BulkWriteError({
+            "nInserted": 1,
+            "writeErrors": [{"code": 11000}, {"code": 121}]
+        })
+        with self.assertRaises(BulkWriteError):
+            MongoDataHandler._insert_ignoring_duplicates(collection, [{}, {}, {}])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import MagicMock, patch
+import pandas as pd
 from model_sities.sities_fetcher import SitiesFetcher
 
 class TestSitiesFetcher(unittest.TestCase):
@@ -70,5 +71,50 @@ class TestSitiesFetcher(unittest.TestCase):
             self.fetcher._handle_result(result)
         self.assertTrue(True)
 
+    @patch('model_sities.sities_fetcher.worker_sities_batch')
+    @patch('model_sities.sities_fetcher.pd.read_csv')
+    def test_process_single_csv_skips_processed_cells(self, mock_read_csv, mock_batch):
+        mock_read_csv.return_value = pd.DataFrame({
+            "municipio": ["A", "B", "C"],
+            "departamento": ["D", "D", "D"],
+            "url_municipio": ["url1", "url2", "url3"]
+        })
+        self.fetcher.data_handler.load_progress.return_value = None
+        self.fetcher.data_handler.get_processed_cells.return_value = {"url2"}
+        sent = []
+
+        def fake_batch(tasks, results):
+            for index, task_info in tasks:
+                sent.append(task_info["url_municipio"])
+                results.put((index, task_info, {"status": "no_results", "municipio": task_info["municipio"]}))
+        mock_batch.side_effect = fake_batch
+
+        self.fetcher._process_single_csv("cells.csv")
+        self.assertEqual(sent, ["url1", "url3"])
+        marked = [c.args[1] for c in self.fetcher.data_handler.mark_cell_processed.call_args_list]
+        self.assertEqual(marked, ["url1", "url3"])
+
+    @patch('model_sities.sities_fetcher.worker_sities_batch')
+    @patch('model_sities.sities_fetcher.pd.read_csv')
+    def test_process_single_csv_resumes_by_processed_cells(self, mock_read_csv, mock_batch):
+        mock_read_csv.return_value = pd.DataFrame({
+            "municipio": ["A", "B", "C", "D"],
+            "departamento": ["D", "D", "D", "D"],
+            "url_municipio": ["url0", "url1", "url2", "url3"]
+        })
+        # Un hilo rápido guardó el índice 3 aunque la fila 1 no terminó
+        self.fetcher.data_handler.load_progress.return_value = {"idx_actual": 3}
+        self.fetcher.data_handler.get_processed_cells.return_value = {"url0", "url2", "url3"}
+        sent = []
+
+        def fake_batch(tasks, results):
+            for index, task_info in tasks:
+                sent.append((index, task_info["url_municipio"]))
+                results.put((index, task_info, {"status": "no_results", "municipio": task_info["municipio"]}))
+        mock_batch.side_effect = fake_batch
+
+        self.fetcher._process_single_csv("cells.csv")
+        self.assertEqual(sent, [(1, "url1")])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
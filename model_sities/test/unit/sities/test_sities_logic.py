@@ -57,17 +57,32 @@ class TestSitiesLogic(unittest.TestCase):
 
     def test_scrape_sites_empty(self):
         self.logic._load_all_results = MagicMock()
-        self.page.query_selector_all.return_value = []
+        self.page.evaluate.return_value = []
         sitios = self.logic._scrape_sites(self.page)
         self.assertEqual(sitios, [])
+        self.page.evaluate.assert_called_once()
 
-    def test_extract_site_data_complete(self):
-        sitio = MagicMock()
-        sitio.query_selector.side_effect = [
-            MagicMock(inner_text=MagicMock(return_value="4.5")),  # puntuacion
-            MagicMock(inner_text=MagicMock(return_value="Museo •")),  # categoria
-            MagicMock(inner_text=MagicMock(return_value="Calle 123")),  # direccion
+    def test_scrape_sites_builds_from_evaluate(self):
+        self.logic._load_all_results = MagicMock()
+        self.page.evaluate.return_value = [
+            {"puntuacion": "8.9", "nombre": "Museo", "href": "/v/museo/abc123",
+             "categoria": "Museo •", "direccion": "Calle 123"},
+            {"puntuacion": None, "nombre": None, "href": None, "categoria": None, "direccion": None},
         ]
+        sitios = self.logic._scrape_sites(self.page)
+        self.assertEqual(len(sitios), 1)
+        self.assertEqual(sitios[0]["id"], "abc123")
+        self.assertEqual(sitios[0]["url_sitio"], f"{self.logic.settings.BASE_URL}/v/museo/abc123")
+        self.assertEqual(sitios[0]["categoria"], "Museo")
+
+    def test_extract_site_data_complete(self):
+        sitio = {
+            "puntuacion": "4.5",
+            "nombre": "Museo",
+            "href": "https://foursquare.com/v/abc123",
+            "categoria": "Museo •",
+            "direccion": "Calle 123",
+        }
         sitio_data = {
             "id": "abc123",
             "puntuacion": "N/A",
@@ -0,0 +1,37 @@
+import queue
+import unittest
+from unittest.mock import MagicMock, patch
+from playwright.sync_api import Error as PlaywrightError
+from model_sities.utils.worker_helper import SiteScraperWorker, shutdown_event
+
+class TestExecuteBatch(unittest.TestCase):
+    def setUp(self):
+        shutdown_event.clear()
+        self.worker = SiteScraperWorker()
+        self.worker._setup_browser = MagicMock(return_value=(MagicMock(), MagicMock(), MagicMock()))
+        self.worker._login = MagicMock(return_value=True)
+
+    @patch('model_sities.utils.worker_helper.sync_playwright')
+    def test_crash_marks_task_failed_and_continues(self, _):
+        self.worker.scrape = MagicMock(side_effect=[
+            ("success", [{"id": "1"}]),
+            PlaywrightError("browser closed"),
+            ("no_results", [])
+        ])
+        tasks = [
+            (i, {"municipio": f"M{i}", "departamento": "D", "url_municipio": f"url{i}"})
+            for i in range(3)
+        ]
+        results = queue.Queue()
+        self.worker.execute_batch(tasks, results)
+
+        statuses = {}
+        while not results.empty():
+            index, _, result = results.get()
+            statuses[index] = result["status"]
+        self.assertEqual(statuses, {0: "success", 1: "playwright_crash", 2: "no_results"})
+        # Tras la caída se abre un navegador nuevo para el resto del bloque
+        self.assertEqual(self.worker._setup_browser.call_count, 2)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -1,4 +1,4 @@
-import json
+import orjson
 import os
 from playwright.sync_api import sync_playwright
 from ..config.settings import Settings
@@ -6,16 +6,16 @@ from ..config.settings import Settings
 
 def save_cookies(page, cookies_path=Settings.COOKIES_JSON):
     cookies = page.context.cookies()
-    with open(cookies_path, "w", encoding="utf-8") as f:
-        json.dump(cookies, f, ensure_ascii=False, indent=4)
+    with open(cookies_path, "wb") as f:
+        f.write(orjson.dumps(cookies, option=orjson.OPT_INDENT_2))
     print(f"Cookies guardadas en {cookies_path}")
 
 def load_cookies(page, cookies_path=Settings.COOKIES_JSON):
     if not os.path.exists(cookies_path):
         print(f"No se encontró el archivo de cookies: {cookies_path}")
         return False
-    with open(cookies_path, "r", encoding="utf-8") as f:
-        cookies = json.load(f)
+    with open(cookies_path, "rb") as f:
+        cookies = orjson.loads(f.read())
     page.context.add_cookies(cookies)
     print("Cookies cargadas correctamente.")
     return True
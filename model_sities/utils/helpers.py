@@ -1,7 +1,8 @@
 """
 Funciones auxiliares para el scraper
 """
-import time, json, os
+import time, os
+import orjson
 from ..config.settings import Settings
 
 
@@ -19,12 +20,12 @@ def save_progress(idx_actual, csv_path, sitios_bloqueados):
         "idx_actual": idx_actual,
         "sitios_bloqueados": sitios_bloqueados
     }
-    with open(Settings.PROGRESS_SITIES, "w", encoding="utf-8") as f:
-        json.dump(progreso, f, ensure_ascii=False, indent=4)
+    with open(Settings.PROGRESS_SITIES, "wb") as f:
+        f.write(orjson.dumps(progreso))
     #print(f"Progreso guardado en {Settings.PROGRESS_SITIES}")
 
 def load_progress():
     if os.path.exists(Settings.PROGRESS_SITIES):
-        with open(Settings.PROGRESS_SITIES, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(Settings.PROGRESS_SITIES, "rb") as f:
+            return orjson.loads(f.read())
     return None
\ No newline at end of file
@@ -1,10 +1,13 @@
 """
 Módulo que define los workers para el scraping.
 """
+import os
+import queue
 import random
 from abc import ABC, abstractmethod
+from collections import deque
 from multiprocessing import Event
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 from playwright.sync_api import sync_playwright, Error as PlaywrightError
 
@@ -30,13 +33,23 @@ class BaseScraperWorker(ABC):
         browser = getattr(playwright, self.settings.BROWSER_TYPE).launch(
             headless=self.settings.HEADLESS
         )
+        # Con una sesión guardada el contexto nace autenticado y no hace falta login manual
+        storage_state = self.settings.STORAGE_STATE_JSON
         context = browser.new_context(
             user_agent=random.choice(self.settings.USER_AGENTS),
-            viewport=random.choice(self.settings.VIEWPORTS)
+            viewport=random.choice(self.settings.VIEWPORTS),
+            storage_state=storage_state if os.path.exists(storage_state) else None
         )
         page = context.new_page()
         return browser, context, page
 
+    def _block_heavy_resources(self, route) -> None:
+        """Aborta imágenes, fuentes y multimedia; el resto de peticiones sigue su curso."""
+        if route.request.resource_type in self.settings.BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
+
     def _login(self, page) -> bool:
         """Login común para todos los workers."""
         return self.auth.login(page)
@@ -56,9 +69,50 @@ class BaseScraperWorker(ABC):
         Ejecución del worker con manejo robusto de recursos para evitar
         fugas de memoria y procesos colgados.
         """
+        results = queue.Queue()
+        self.execute_batch([(0, task_info)], results)
+        return results.get()[2]
+
+    def execute_batch(
+        self,
+        tasks: List[Tuple[int, Dict[str, Any]]],
+        results: queue.Queue
+    ) -> None:
+        """
+        Procesa varias tareas seguidas con un solo navegador y un solo login,
+        dejando en la cola (índice, tarea, resultado) por cada tarea. Si el
+        navegador cae, la tarea en curso se da por fallida y el resto continúa
+        con un navegador nuevo.
+        """
+        pending = deque(tasks)
         if shutdown_event.is_set():
-            return {**self.get_default_result(task_info), "status": "shutdown"}
-
+            # No se abre navegador si ya se pidió el apagado
+            while pending:
+                index, task_info = pending.popleft()
+                results.put((
+                    index,
+                    task_info,
+                    {**self.get_default_result(task_info), "status": "shutdown"}
+                ))
+        while pending:
+            status = self._execute_session(pending, results)
+            if pending:
+                index, task_info = pending.popleft()
+                results.put((
+                    index,
+                    task_info,
+                    {**self.get_default_result(task_info), "status": status}
+                ))
+
+    def _execute_session(
+        self,
+        pending: deque,
+        results: queue.Queue
+    ) -> Optional[str]:
+        """
+        Abre un navegador, inicia sesión y consume tareas de `pending` hasta
+        vaciarla. Devuelve el estado de error si la sesión se interrumpe.
+        """
         try:
             with sync_playwright() as p:
                 browser = None
@@ -66,22 +120,20 @@ class BaseScraperWorker(ABC):
                 page = None
                 try:
                     browser, context, page = self._setup_browser(p)
-
-                    if not self._login(page):
-                        return {
-                            **self.get_default_result(task_info),
-                            "status": "auth_error"
-                        }
-
-                    status, data = self.scrape(page, task_info)
-
-                    result = self.get_default_result(task_info)
-                    result["status"] = status
-                    if isinstance(self, SiteScraperWorker):
-                        result["sites"] = data
-                    elif isinstance(self, ReviewerScraperWorker):
-                        result["users"] = data
-                    return result
+                    logged_in = self._login(page)
+                    if logged_in:
+                        # Se bloquea tras el login para no romper captcha ni imágenes del 2FA
+                        context.route("**/*", self._block_heavy_resources)
+
+                    while pending:
+                        index, task_info = pending[0]
+                        results.put((
+                            index,
+                            task_info,
+                            self._run_task(page, task_info, logged_in)
+                        ))
+                        pending.popleft()
+                    return None
                 finally:
                     # Limpieza DENTRO del bloque 'with'
                     if page:
@@ -92,16 +144,32 @@ class BaseScraperWorker(ABC):
                         browser.close()
         except PlaywrightError as e:
             print(f"[WORKER CRASH] Error grave de Playwright: {e}")
-            return {
-                **self.get_default_result(task_info),
-                "status": "playwright_crash"
-            }
+            return "playwright_crash"
         except Exception as e:
             print(f"[WORKER ERROR] Error inesperado en worker: {e}")
-            return {
-                **self.get_default_result(task_info),
-                "status": "worker_error"
-            }
+            return "worker_error"
+
+    def _run_task(
+        self,
+        page,
+        task_info: Dict[str, Any],
+        logged_in: bool
+    ) -> Dict[str, Any]:
+        """Ejecuta una tarea sobre la página ya autenticada."""
+        if shutdown_event.is_set():
+            return {**self.get_default_result(task_info), "status": "shutdown"}
+        if not logged_in:
+            return {**self.get_default_result(task_info), "status": "auth_error"}
+
+        status, data = self.scrape(page, task_info)
+
+        result = self.get_default_result(task_info)
+        result["status"] = status
+        if isinstance(self, SiteScraperWorker):
+            result["sites"] = data
+        elif isinstance(self, ReviewerScraperWorker):
+            result["users"] = data
+        return result
 
 
 class ReviewerScraperWorker(BaseScraperWorker):
@@ -160,4 +228,13 @@ def worker_users(task_info: Dict[str, Any]) -> Dict[str, Any]:
 def worker_sities(task_info: Dict[str, Any]) -> Dict[str, Any]:
     """Wrapper para el worker de sitios."""
     worker = SiteScraperWorker()
-    return worker.execute(task_info)
\ No newline at end of file
+    return worker.execute(task_info)
+
+
+def worker_sities_batch(
+    tasks: List[Tuple[int, Dict[str, Any]]],
+    results: queue.Queue
+) -> None:
+    """Wrapper para procesar un bloque de tareas de sitios con un solo navegador."""
+    worker = SiteScraperWorker()
+    worker.execute_batch(tasks, results)
\ No newline at end of file
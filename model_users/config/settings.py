@@ -3,32 +3,57 @@ import os
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 RESULTADOS_DIR = os.path.join(BASE_DIR, "resultados")
-TIPS_DIR = os.path.join(RESULTADOS_DIR, "tips")
-USERS_DIR = os.path.join(RESULTADOS_DIR, "users")
+TIPS_NDJSON = os.path.join(RESULTADOS_DIR, "tips.ndjson")
+USERS_NDJSON = os.path.join(RESULTADOS_DIR, "users.ndjson")
 LOGS_ERROR_DIR = os.path.join(BASE_DIR, "logs_error")
-ERROR_TIPS_PATH = os.path.join(LOGS_ERROR_DIR, "error_tips.json")
+ERROR_TIPS_PATH = os.path.join(LOGS_ERROR_DIR, "error_tips.ndjson")
 PROGRESO_PATH = os.path.join("progreso_resenas_usuarios.json")
+PROGRESO_LOG_PATH = os.path.join("progreso_resenas_usuarios.ndjson")
 COOKIES_PATH = os.path.join("cookies_foursquare.json")
+CREDENTIALS_FILE = os.path.join("credentials.txt")
 USERS_CSV = os.path.join("merge_user_altlantico_bolivar_no_duplicates.csv")
 
 class Settings:
     BASE_DIR = BASE_DIR
     DATA_DIR = DATA_DIR
     RESULTADOS_DIR = RESULTADOS_DIR
-    TIPS_DIR = TIPS_DIR
-    USERS_DIR = USERS_DIR
+    TIPS_NDJSON = TIPS_NDJSON
+    USERS_NDJSON = USERS_NDJSON
     LOGS_ERROR_DIR = LOGS_ERROR_DIR
     ERROR_TIPS_PATH = ERROR_TIPS_PATH
     PROGRESO_PATH = PROGRESO_PATH
+    PROGRESO_LOG_PATH = PROGRESO_LOG_PATH
     COOKIES_PATH = COOKIES_PATH
+    CREDENTIALS_FILE = CREDENTIALS_FILE
     USERS_CSV = USERS_CSV
     BROWSER_TYPE = "firefox"
     HEADLESS = True
+    CONTEXTS_PER_WORKER = 8  # Usuarios en vuelo a la vez dentro de cada worker
+    USERS_PER_BATCH = 32  # Usuarios enviados a un worker por llamada
+    BROWSER_MAX_PAGES = 50  # Usuarios atendidos antes de relanzar el navegador del worker
+    BROWSER_MAX_AGE_SECONDS = 600  # Antigüedad máxima del navegador antes de relanzarlo
+    # Solo se lee texto del DOM: estos recursos se bloquean para acelerar la carga
+    BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+    BLOCKED_HOSTS_REGEX = r"googletagmanager|google-analytics|doubleclick|facebook|hotjar"
+    # Camino rápido sin navegador por el endpoint JSON de tips. Apagado: esos registros no
+    # traen user_location ni el texto de fecha de la web, y el navegador sí los llena
+    TIPS_HTTP_FAST_PATH = False
+    PROGRESS_FLUSH_USERS = 50
+    PROGRESS_FLUSH_SECONDS = 10
+    NDJSON_BUFFER_SIZE = 1 << 20
+    # Login (core/auth.py)
+    BASE_URL = "https://es.foursquare.com"
+    LOGIN_URL = f"{BASE_URL}/login"
+    WAIT_SHORT_MIN = 3000
+    WAIT_MEDIUM_MIN = 5000
+    SELECTORS = {
+        'login_username': 'input[id="username"]',
+        'login_password': 'input[id="password"]',
+        'login_button': 'input[id="loginFormButton"]',
+    }
 
     @classmethod
     def create_output_dirs(cls):
         os.makedirs(cls.RESULTADOS_DIR, exist_ok=True)
-        os.makedirs(cls.TIPS_DIR, exist_ok=True)
-        os.makedirs(cls.USERS_DIR, exist_ok=True)
         os.makedirs(cls.LOGS_ERROR_DIR, exist_ok=True)
         os.makedirs(cls.DATA_DIR, exist_ok=True)
\ No newline at end of file
@@ -1,35 +1,385 @@
 import os
-import json
-import pandas as pd
-import numpy as np
-from playwright.sync_api import sync_playwright
+import csv
+import re
+import orjson
+import time
+import queue
+import threading
+import atexit
+import multiprocessing
+import asyncio
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from playwright.async_api import async_playwright
 from config.settings import Settings
-from utils.helpers import guardar_progreso, cargar_progreso, save_log_error
-from utils.cookies_helper import cargar_cookies_playwright
-
-def process_user(info):
-    """
-    Función para ser ejecutada en paralelo por cada usuario.
-    """
-    with sync_playwright() as p:
-        browser = getattr(p, Settings.BROWSER_TYPE).launch(headless=Settings.HEADLESS)
-        page = browser.new_page()
-        if not cargar_cookies_playwright(page, Settings.COOKIES_PATH):
-            print("Error cargando cookies")
-            browser.close()
-            return info['url_usuario'].split('/')[-1], False
-        extractor = UserReviewsExtractor()
-        resultado = extractor._extract_reviews_from_user(page, info)
-        user_id = info['url_usuario'].split('/')[-1]
-        if resultado["tips"]:
-            tips_path = os.path.join(Settings.TIPS_DIR, f'tips_{user_id}.json')
-            users_path = os.path.join(Settings.USERS_DIR, f'user_{user_id}.json')
-            with open(tips_path, 'w', encoding='utf-8') as file:
-                json.dump(resultado["tips"], file, ensure_ascii=False, indent=4)
-            with open(users_path, 'w', encoding='utf-8') as file:
-                json.dump(resultado["user_info"], file, ensure_ascii=False, indent=4)
-        browser.close()
-        return user_id, True
+from utils.helpers import guardar_progreso, cargar_progreso, registrar_usuario_procesado, save_log_error
+from utils.cookies_helper import leer_cookies
+
+_TIPS_CONTAINER_SELECTOR = '.tipsContainerAll'
+_TIP_CARD_CLASS = '.tipCard'
+_TIP_CARD_SELECTOR = f'{_TIPS_CONTAINER_SELECTOR} {_TIP_CARD_CLASS}'
+_USER_LOCATION_SELECTOR = '.userLocation'
+_TIPS_HEADER_SELECTOR = '.userTipsHeader'
+# Botones numerados del paginador; el de la página n lleva además la clase 'page<n>'
+_PAGINATION_SELECTOR = '.paginationComponent.page'
+_PAGE_BUTTON_SELECTOR = f'{_PAGINATION_SELECTOR}.page'
+
+# Extrae en una sola llamada al navegador la ubicación del usuario, el total de
+# páginas y todos los tips visibles, en lugar de varias consultas por tip.
+# Con withTips=false solo cuenta las tarjetas, para cuando los tips llegan por JSON.
+# Los selectores llegan como argumento desde las constantes de arriba (_args_extraccion).
+_EXTRACT_TIPS_JS = r"""
+({ withTips, containerSelector, cardSelector, paginationSelector, locationSelector }) => {
+    const text = el => el ? el.innerText : null;
+    const pages = Array.from(document.querySelectorAll(paginationSelector))
+        .map(el => parseInt(el.innerText, 10))
+        .filter(n => !isNaN(n));
+    const container = document.querySelector(containerSelector);
+    const cards = container ? Array.from(container.querySelectorAll(cardSelector)) : null;
+    return {
+        user_location: text(document.querySelector(locationSelector)),
+        total_pages: pages.length ? Math.max(...pages) : 1,
+        tip_count: cards ? cards.length : null,
+        tips: cards && withTips ? cards.map(card => {
+            const category = card.querySelector('.category');
+            const sibling = category ? category.nextSibling : null;
+            const raw = sibling ? sibling.textContent : null;
+            return {
+                date: text(card.querySelector('.tipDate')),
+                reviewed_place: text(card.querySelector('.tipVenueInfo > a')),
+                reviewed_category: text(category),
+                reviewed_location: raw ? raw.replace(/^[·\s]+|[·\s]+$/g, '') : null,
+                comment: text(card.querySelector('.tipContent')),
+                score: text(card.querySelector('.venueScore')),
+            };
+        }) : null,
+    };
+}
+"""
+
+def _args_extraccion(with_tips):
+    """Argumentos de _EXTRACT_TIPS_JS."""
+    return {
+        'withTips': with_tips,
+        'containerSelector': _TIPS_CONTAINER_SELECTOR,
+        'cardSelector': _TIP_CARD_CLASS,
+        'paginationSelector': _PAGINATION_SELECTOR,
+        'locationSelector': _USER_LOCATION_SELECTOR,
+    }
+
+_PAGE_CHANGED_JS = """
+({ el, text, selector }) => {
+    const card = document.querySelector(selector);
+    return !!card && (card !== el || card.innerText !== text);
+}
+"""
+
+# Pool persistente del proceso principal y estado persistente de cada worker
+_POOL = None
+_LOOP = None
+_PLAYWRIGHT = None
+_BROWSER = None
+_BROWSER_PAGES = 0
+_BROWSER_STARTED = 0.0
+_COOKIES = None
+_EXTRACTOR = None
+_STORAGE_STATE = None
+_API = None
+# URL del endpoint de tips aprendida en la primera visita con navegador, con {user_id} como comodín
+_TIPS_API_TEMPLATE = None
+
+# Campos de un registro de tip; los que no aporta la fuente (DOM o API) quedan a None.
+# 'date' y 'reviewed_location' son el texto que muestra la web; 'created_at' (YYYY-MM-DD en UTC)
+# y 'venue_location' son los valores equivalentes del endpoint JSON.
+# 'source' indica de dónde sale el tip: 'dom' (tarjetas de la página), 'api' (endpoint JSON
+# leído desde el navegador) o 'http' (camino rápido sin navegador, sin 'user_location').
+_TIP_VACIO = dict.fromkeys((
+    'date', 'created_at', 'reviewed_place', 'reviewed_category',
+    'reviewed_location', 'venue_location', 'comment', 'score',
+))
+
+def _registro_tip(info, user_id, user_location, tip, source):
+    """
+    Construye el registro de un tip con los datos del usuario y todos los campos de _TIP_VACIO.
+    """
+    return {
+        'user': info['nombre_usuario'], 'user_id': user_id, 'user_location': user_location,
+        **_TIP_VACIO, **tip, 'source': source,
+    }
+
+def _api_page_url(api_url, page_number, offset):
+    """
+    Construye la URL del endpoint de tips para otra página, según pagine por offset o por page.
+    `offset` es el número de tips ya leídos, así no depende del 'limit' de la URL.
+    """
+    partes = urlsplit(api_url)
+    params = dict(parse_qsl(partes.query))
+    if 'offset' in params:
+        params['offset'] = str(offset)
+    elif 'page' in params:
+        params['page'] = str(page_number)
+    else:
+        return None
+    return urlunsplit(partes._replace(query=urlencode(params)))
+
+def _tip_from_api(item):
+    """
+    Convierte un tip del endpoint JSON a los campos de _TIP_VACIO. La fecha y la ubicación
+    van en 'created_at' y 'venue_location' porque no tienen el formato del texto de la web.
+    """
+    venue = item.get('venue') or {}
+    categories = venue.get('categories') or [{}]
+    location = venue.get('location') or {}
+    created_at = item.get('createdAt')
+    rating = venue.get('rating')
+    return {
+        'created_at': time.strftime('%Y-%m-%d', time.gmtime(created_at)) if created_at else None,
+        'reviewed_place': venue.get('name'),
+        'reviewed_category': categories[0].get('name'),
+        'venue_location': ', '.join(filter(None, [location.get('city'), location.get('state')])) or None,
+        'comment': item.get('text'),
+        'score': str(rating) if rating is not None else None,
+    }
+
+def _plantilla_api_tips(api_url, user_id):
+    """
+    Convierte la URL del endpoint de tips de un usuario en una plantilla válida para cualquier otro.
+    Devuelve None si el id no aparece en la ruta o la URL no admite paginación.
+    """
+    partes = urlsplit(api_url)
+    segmentos = partes.path.split('/')
+    if user_id not in segmentos or _api_page_url(api_url, 1, 0) is None:
+        return None
+    segmentos[segmentos.index(user_id)] = '{user_id}'
+    return urlunsplit(partes._replace(path='/'.join(segmentos)))
+
+async def _leer_bloque_tips(response):
+    """
+    Devuelve el bloque 'tips' de una respuesta del endpoint JSON, o None si la respuesta es un error.
+    """
+    if not response.ok:
+        return None
+    return orjson.loads(await response.body())['response']['tips']
+
+async def _get_tips_api(request, page_url):
+    """
+    Pide una página al endpoint JSON de tips. Devuelve el bloque 'tips' de la respuesta,
+    o None si el endpoint rechaza la petición (403, desafío JS...) o no devuelve JSON.
+    """
+    try:
+        return await _leer_bloque_tips(await request.get(page_url))
+    except Exception as e:
+        print(f"Error consultando la API de tips: {e}")
+        return None
+
+async def _recorrer_api_tips(request, api_url, bloque=None):
+    """
+    Recorre el endpoint JSON de tips hasta leer el 'count' que declara la propia respuesta.
+    `bloque` es la primera página si ya se tiene. Devuelve None si alguna página falla
+    o la respuesta no trae 'count', para no dar por completa una lista truncada.
+    """
+    tips = []
+    page_number = 1
+    while True:
+        if bloque is None:
+            page_url = _api_page_url(api_url, page_number, len(tips))
+            if page_url is None:
+                return None
+            bloque = await _get_tips_api(request, page_url)
+            if bloque is None:
+                return None
+        if 'count' not in bloque:
+            return None
+        items = bloque.get('items') or []
+        tips.extend(_tip_from_api(item) for item in items)
+        if not items or len(tips) >= bloque['count']:
+            return tips
+        bloque = None
+        page_number += 1
+
+async def _fetch_tips_http(info):
+    """
+    Camino rápido sin navegador: recorre el endpoint JSON de tips con las cookies de la sesión.
+    Devuelve None si hay que recurrir al navegador, también si el usuario no tiene tips:
+    así el navegador comprueba la página y lo registra con save_log_error como siempre.
+    """
+    user_id = info['user_id']
+    tips = await _recorrer_api_tips(_API, _TIPS_API_TEMPLATE.replace('{user_id}', user_id))
+    if not tips:
+        return None
+    return [_registro_tip(info, user_id, None, tip, 'http') for tip in tips]
+
+def _worker_init():
+    """
+    Inicializa el event loop, Playwright, el navegador y las cookies una sola vez por proceso worker.
+    """
+    global _LOOP, _PLAYWRIGHT, _COOKIES, _STORAGE_STATE, _API, _EXTRACTOR
+    _COOKIES = leer_cookies(Settings.COOKIES_PATH)
+    # Un extractor por worker: los directorios de salida se crean una vez, no por usuario
+    _EXTRACTOR = UserReviewsExtractor()
+    _LOOP = asyncio.new_event_loop()
+    asyncio.set_event_loop(_LOOP)
+    _PLAYWRIGHT = _LOOP.run_until_complete(async_playwright().start())
+    _LOOP.run_until_complete(_lanzar_navegador())
+    if _COOKIES is not None:
+        # Las cookies se pasan al crear cada contexto, sin add_cookies por usuario
+        _STORAGE_STATE = {"cookies": _COOKIES, "origins": []}
+        if Settings.TIPS_HTTP_FAST_PATH:
+            # Cliente HTTP de Playwright con las cookies de la sesión, sin abrir páginas
+            _API = _LOOP.run_until_complete(_PLAYWRIGHT.request.new_context(storage_state=_STORAGE_STATE))
+
+async def _lanzar_navegador():
+    global _BROWSER, _BROWSER_PAGES, _BROWSER_STARTED
+    _BROWSER = await getattr(_PLAYWRIGHT, Settings.BROWSER_TYPE).launch(headless=Settings.HEADLESS)
+    _BROWSER_PAGES = 0
+    _BROWSER_STARTED = time.monotonic()
+
+async def _reciclar_navegador():
+    """
+    Relanza el navegador del worker para liberar la memoria que Firefox acumula con el uso.
+    Solo se llama entre lotes, cuando no queda ningún contexto abierto.
+    """
+    await _BROWSER.close()
+    await _lanzar_navegador()
+
+def _get_pool(max_workers):
+    """
+    Devuelve el pool de procesos persistente, creándolo en la primera llamada.
+    """
+    global _POOL
+    if _POOL is None:
+        # Playwright no es seguro tras fork: cada worker arranca en un intérprete limpio
+        _POOL = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_worker_init,
+        )
+        atexit.register(_shutdown_pool)
+    return _POOL
+
+def _shutdown_pool():
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown(wait=True)
+        _POOL = None
+
+_BLOCKED_HOSTS = re.compile(Settings.BLOCKED_HOSTS_REGEX)
+
+async def _bloquear_recursos(route):
+    request = route.request
+    # Se compara solo el host para no bloquear URLs de Foursquare que mencionen esos nombres
+    if (request.resource_type in Settings.BLOCKED_RESOURCE_TYPES
+            or _BLOCKED_HOSTS.search(urlsplit(request.url).hostname or '')):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def _scrape_one(info):
+    """
+    Extrae los tips de un usuario en un contexto propio del navegador compartido.
+    Devuelve (user_id, user_info, tips); la escritura a disco la hace el proceso principal.
+    """
+    global _TIPS_API_TEMPLATE, _BROWSER_PAGES
+    user_id = info['user_id']
+    if _COOKIES is None:
+        print("Error cargando cookies")
+        return user_id, None, []
+    if Settings.TIPS_HTTP_FAST_PATH and _TIPS_API_TEMPLATE is not None:
+        tips = await _fetch_tips_http(info)
+        if tips is not None:
+            print(f"Reseñante: {info['nombre_usuario']}, ID: {user_id}, Total de tips (API): {len(tips)}")
+            return user_id, {'user': info['nombre_usuario'], 'user_id': user_id}, tips
+    context = await _BROWSER.new_context(storage_state=_STORAGE_STATE)
+    _BROWSER_PAGES += 1
+    await context.route("**/*", _bloquear_recursos)
+    try:
+        page = await context.new_page()
+        resultado = await _EXTRACTOR._extract_reviews_from_user(page, info, user_id)
+        if Settings.TIPS_HTTP_FAST_PATH and _TIPS_API_TEMPLATE is None and resultado.get("api_url"):
+            _TIPS_API_TEMPLATE = _plantilla_api_tips(resultado["api_url"], user_id)
+        return user_id, resultado["user_info"], resultado["tips"]
+    finally:
+        await context.close()
+
+async def _procesar_lote(infos):
+    """
+    Reparte el lote entre Settings.CONTEXTS_PER_WORKER consumidores de una cola: cada uno toma
+    el siguiente usuario en cuanto termina el anterior. Los resultados conservan el orden del lote
+    y los errores se devuelven en su posición, como excepciones.
+    """
+    cola = asyncio.Queue()
+    for posicion, info in enumerate(infos):
+        cola.put_nowait((posicion, info))
+    resultados = [None] * len(infos)
+
+    async def _consumidor():
+        while not cola.empty():
+            posicion, info = cola.get_nowait()
+            try:
+                resultados[posicion] = await _scrape_one(info)
+            except Exception as e:
+                resultados[posicion] = e
+
+    await asyncio.gather(*[_consumidor() for _ in range(min(Settings.CONTEXTS_PER_WORKER, len(infos)))])
+    return resultados
+
+def process_user_batch(infos):
+    """
+    Función para ser ejecutada en paralelo por cada lote de usuarios.
+    Los usuarios del lote se procesan en el event loop del worker, con a lo sumo
+    Settings.CONTEXTS_PER_WORKER contextos abiertos a la vez.
+    """
+    if (_BROWSER_PAGES >= Settings.BROWSER_MAX_PAGES
+            or time.monotonic() - _BROWSER_STARTED > Settings.BROWSER_MAX_AGE_SECONDS):
+        _LOOP.run_until_complete(_reciclar_navegador())
+    return _LOOP.run_until_complete(_procesar_lote(infos))
+
+def _escribir_resultados(cola, filas_pendientes, total_filas):
+    """
+    Hilo escritor del proceso principal: vuelca tips y usuarios a NDJSON y guarda
+    el progreso por lotes, mientras los workers siguen navegando. Termina al recibir None.
+    idx_actual es la fila del CSV más baja aún sin terminar (o total_filas si no queda
+    ninguna): un usuario que falla la retiene y se reintenta en la siguiente ejecución.
+    """
+    filas_pendientes = deque(filas_pendientes)
+    terminadas = set()
+
+    def _fila_sin_terminar():
+        while filas_pendientes and filas_pendientes[0] in terminadas:
+            terminadas.discard(filas_pendientes.popleft())
+        return filas_pendientes[0] if filas_pendientes else total_filas
+
+    pendientes = 0
+    ultimo_flush = time.monotonic()
+    with open(Settings.TIPS_NDJSON, 'ab', buffering=Settings.NDJSON_BUFFER_SIZE) as tips_file, \
+            open(Settings.USERS_NDJSON, 'ab', buffering=Settings.NDJSON_BUFFER_SIZE) as users_file:
+        try:
+            while (resultado := cola.get()) is not None:
+                fila, (user_id, user_info, tips) = resultado
+                if tips:
+                    for tip in tips:
+                        tips_file.write(orjson.dumps(tip) + b"\n")
+                    # La fecha de extracción va dentro del registro, no en el nombre de ningún archivo
+                    users_file.write(orjson.dumps({**user_info, 'scraped_at': int(time.time())}) + b"\n")
+                terminadas.add(fila)
+                pendientes += 1
+                registrar_usuario_procesado(user_id)
+                print(f"Usuario {user_id} procesado. Éxito: {user_info is not None}")
+                if (pendientes >= Settings.PROGRESS_FLUSH_USERS
+                        or time.monotonic() - ultimo_flush > Settings.PROGRESS_FLUSH_SECONDS):
+                    tips_file.flush()
+                    users_file.flush()
+                    guardar_progreso(_fila_sin_terminar())
+                    pendientes = 0
+                    ultimo_flush = time.monotonic()
+        finally:
+            # Al terminar se fuerza la escritura a disco; durante la ejecución basta con flush
+            for archivo in (tips_file, users_file):
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            guardar_progreso(_fila_sin_terminar(), sync=True)
 
 class UserReviewsExtractor:
     def __init__(self):
@@ -37,7 +387,8 @@ class UserReviewsExtractor:
 
     def extract_reviews_from_csv(self, csv_path: str, max_workers: int = 2) -> None:
         try:
-            df = pd.read_csv(csv_path, sep=',')
+            with open(csv_path, newline='', encoding='utf-8') as f:
+                filas = list(csv.DictReader(f))
         except Exception as e:
             print(f"Error cargando CSV {csv_path}: {e}")
             return
@@ -48,48 +399,80 @@ class UserReviewsExtractor:
 
         print(f"Iniciando desde el índice {start_idx}, {len(processed_user_ids)} usuarios ya procesados")
 
+        # El user_id se calcula una sola vez por fila; los repetidos en el CSV se descartan aquí
+        vistos = processed_user_ids
         usuarios_pendientes = []
-        for idx, (_, info) in enumerate(df.iterrows()):
-            if idx < start_idx:
+        for numero_fila, fila in enumerate(filas[start_idx:], start=start_idx):
+            url = fila.get('url_usuario')
+            if not url:
+                continue
+            user_id = url.rsplit('/', 1)[-1]
+            if user_id in vistos:
                 continue
-            user_id = info['url_usuario'].split('/')[-1]
-            if user_id not in processed_user_ids:
-                usuarios_pendientes.append(info)
+            vistos.add(user_id)
+            usuarios_pendientes.append(
+                {'url_usuario': url, 'nombre_usuario': fila.get('nombre_usuario') or '', 'user_id': user_id,
+                 'fila': numero_fila}
+            )
 
         print(f"Total de usuarios pendientes: {len(usuarios_pendientes)}")
 
-        from concurrent.futures import ProcessPoolExecutor, as_completed
-
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(process_user, info): info for info in usuarios_pendientes}
-            for idx, future in enumerate(as_completed(futures)):
-                user_id, success = future.result()
-                processed_user_ids.add(user_id)
-                guardar_progreso(start_idx + idx + 1, processed_user_ids)
-                print(f"Usuario {user_id} procesado. Éxito: {success}")
+        lote = Settings.USERS_PER_BATCH
+        lotes = [usuarios_pendientes[i:i + lote] for i in range(0, len(usuarios_pendientes), lote)]
+        executor = _get_pool(max_workers)
+        cola = queue.Queue()
+        filas_pendientes = [info['fila'] for info in usuarios_pendientes]
+        escritor = threading.Thread(
+            target=_escribir_resultados, args=(cola, filas_pendientes, len(filas)), daemon=True
+        )
+        escritor.start()
+        try:
+            # Cada resultado viaja con la fila del CSV de su usuario para calcular idx_actual
+            for infos, resultados in zip(lotes, executor.map(process_user_batch, lotes)):
+                for info, resultado in zip(infos, resultados):
+                    if isinstance(resultado, Exception):
+                        print(f"Error procesando usuario: {resultado}")
+                        continue
+                    cola.put((info['fila'], resultado))
+        finally:
+            cola.put(None)
+            escritor.join()
 
         print("Todos los usuarios han sido procesados")
 
-    def _extract_reviews_from_user(self, page, info: dict) -> dict:
+    async def _extract_reviews_from_user(self, page, info: dict, user_id: str) -> dict:
         url = info['url_usuario']
-        user_id = url.split('/')[-1]
         user_info = {'user': info['nombre_usuario'], 'user_id': user_id}
 
+        # La web pide los tips a un endpoint JSON; se guarda la última URL para paginar sin el DOM
+        tips_api = {}
+        def _capturar_api_tips(response):
+            if ('/tips' in response.url and response.request.resource_type in ('xhr', 'fetch')
+                    and 'json' in response.headers.get('content-type', '')):
+                tips_api['url'] = response.url
+                tips_api['response'] = response
+        page.on("response", _capturar_api_tips)
+
         max_reintentos = 3
         for intento in range(max_reintentos):
             try:
-                page.goto(url, timeout=60000)
+                await page.goto(url, wait_until='domcontentloaded', timeout=15000)
                 break
             except Exception as e:
                 print(f"[{user_id}] Intento {intento+1} falló al navegar a {url}: {e}")
                 if intento == max_reintentos - 1:
                     print(f"[{user_id}] No se pudo cargar la página tras {max_reintentos} intentos. Saltando usuario.")
                     return {"user_info": user_info, "tips": []}
-                page.wait_for_timeout(5000)
+                await asyncio.sleep(5)
 
-        see_all = page.query_selector_all('.userTipsHeader > button')
+        try:
+            await page.wait_for_selector(_TIPS_HEADER_SELECTOR, timeout=10000)
+        except Exception:
+            # Sin cabecera de tips: se registra abajo como usuario sin botón 'Ver todos los tips'
+            pass
+        see_all = await page.query_selector_all(f'{_TIPS_HEADER_SELECTOR} > button')
         if not see_all:
-            see_all = page.query_selector_all('.userTipsHeader > a')
+            see_all = await page.query_selector_all(f'{_TIPS_HEADER_SELECTOR} > a')
         see_all = see_all[-1] if see_all else None
         if not see_all:
             print(f"Error: No se encontró el botón 'Ver todos los tips' para {info['nombre_usuario']}")
@@ -98,73 +481,89 @@ class UserReviewsExtractor:
         max_intentos = 3
         for intento in range(max_intentos):
             try:
-                see_all.click(timeout=10000)
+                await see_all.click(timeout=10000)
                 break
             except Exception as e:
                 if intento < max_intentos - 1:
                     print(f"Reintentando clic en 'Ver todos los tips' para {info['nombre_usuario']}: {e}")
-                    page.wait_for_timeout(np.random.uniform(2000, 3000))
+                    await asyncio.sleep(random.uniform(2, 3))
                 else:
                     print(f"No se pudo hacer clic en 'Ver todos los tips' para {info['nombre_usuario']}")
                     return {"user_info": user_info, "tips": []}
-        page.wait_for_timeout(np.random.uniform(4000, 6000))
-        user_location = page.query_selector('.userLocation')
-        user_location = user_location.inner_text() if user_location else None
+        try:
+            await page.locator(_TIP_CARD_SELECTOR).first.wait_for(state='attached', timeout=10000)
+        except Exception as e:
+            print(f"No se cargaron los tips de {info['nombre_usuario']}: {e}")
+        user_location = None
         total_pages = 1
-        if pages := page.query_selector_all('.paginationComponent.page'):
-            try:
-                last_page = [p for p in pages if p.inner_text().isdigit()][-1]
-                total_pages = int(last_page.inner_text())
-            except (ValueError, IndexError):
-                print("Error getting total pages")
         user_tips = []
-        for page_number in range(1, total_pages + 1):
+        api_url = None
+        page_number = 1
+        while page_number <= total_pages:
             try:
-                page.wait_for_selector('.tipsContainerAll', timeout=10000)
-                tips_container = page.query_selector('.tipsContainerAll')
-                if not tips_container:
-                    print(f"Error: No se encontró el contenedor de tips para {info['nombre_usuario']}")
+                # La página 1 ya se esperó tras el clic en 'ver todos'; las siguientes las espera _go_to_page
+                if page_number > 1 and not await self._go_to_page(page, page_number):
                     break
-                tips = tips_container.query_selector_all('.tipCard')
-                for tip in tips:
-                    try:
-                        tip_info = {}
-                        tip_info['user'] = info['nombre_usuario']
-                        tip_info['user_id'] = user_id
-                        tip_info['user_location'] = user_location
-                        date_element = tip.query_selector('.tipDate')
-                        tip_info['date'] = date_element.inner_text() if date_element else None
-                        place_element = tip.query_selector('.tipVenueInfo > a')
-                        tip_info['reviewed_place'] = place_element.inner_text() if place_element else None
-                        category_element = tip.query_selector('.category')
-                        tip_info['reviewed_category'] = category_element.inner_text() if category_element else None
-                        location = None
-                        if category_element:
-                            sibling_text = category_element.evaluate_handle('el => el.nextSibling')
-                            if sibling_text:
-                                raw_text = sibling_text.evaluate('n => n.textContent')
-                                location = raw_text.strip("· ").strip() if (raw_text and raw_text != '') else None
-                        tip_info['reviewed_location'] = location
-                        comment_element = tip.query_selector('.tipContent')
-                        tip_info['comment'] = comment_element.inner_text() if comment_element else None
-                        score_element = tip.query_selector('.venueScore')
-                        tip_info['score'] = score_element.inner_text() if score_element else None
-                        user_tips.append(tip_info)
-                    except Exception as e:
-                        print(f"Error procesando un tip: {e}")
-                if total_pages > 1 and page_number < total_pages:
-                    try:
-                        next_page = page.query_selector(f'.paginationComponent.page.page{page_number + 1}')
-                        if next_page:
-                            next_page.click(timeout=10000)
-                            page.wait_for_timeout(np.random.uniform(3000, 5000))
-                        else:
-                            print(f"Error: No se encontró el botón de siguiente página {page_number + 1}")
-                            break
-                    except Exception as e:
-                        print(f"Error en paginación: {e}")
+                # En la página 1 se usa el JSON que ya trajo la web, si coincide con las tarjetas visibles
+                bloque = await self._tips_capturados(tips_api) if page_number == 1 else None
+                datos = await page.evaluate(_EXTRACT_TIPS_JS, _args_extraccion(bloque is None))
+                if page_number == 1:
+                    user_location = datos['user_location']
+                    total_pages = datos['total_pages']
+                if bloque is not None and len(bloque.get('items') or []) == datos['tip_count']:
+                    # Todo el usuario sale de la API, paginada por su propio 'count' y no por el
+                    # paginador del DOM, para no mezclar en un usuario tips de las dos fuentes.
+                    # Una respuesta capturada que no es la lista visible (p. ej. una vista previa)
+                    # tendría otro tamaño de página, por eso solo se usa si coincide.
+                    api_tips = await _recorrer_api_tips(page.request, tips_api['url'], bloque)
+                    if api_tips is not None:
+                        api_url = tips_api['url']
+                        user_tips = [_registro_tip(info, user_id, user_location, tip, 'api') for tip in api_tips]
                         break
+                    print(f"[{user_id}] API de tips no disponible, se continúa por el DOM")
+                if bloque is not None:
+                    datos = await page.evaluate(_EXTRACT_TIPS_JS, _args_extraccion(True))
+                if datos['tips'] is None:
+                    print(f"Error: No se encontró el contenedor de tips para {info['nombre_usuario']}")
+                    break
+                user_tips.extend(_registro_tip(info, user_id, user_location, tip, 'dom') for tip in datos['tips'])
             except Exception as e:
                 print(f"Error procesando página {page_number}: {e}")
+            page_number += 1
         print(f"Reseñante: {info['nombre_usuario']}, ID: {user_id}, Total de tips: {len(user_tips)}")
-        return {"user_info": user_info, "tips": user_tips}
\ No newline at end of file
+        return {"user_info": user_info, "tips": user_tips, "api_url": api_url}
+
+    async def _go_to_page(self, page, page_number: int) -> bool:
+        """Hace clic en el botón de la página indicada del paginador."""
+        try:
+            next_page = await page.query_selector(_PAGE_BUTTON_SELECTOR + str(page_number))
+            if not next_page:
+                print(f"Error: No se encontró el botón de siguiente página {page_number}")
+                return False
+            first_tip = await page.query_selector(_TIP_CARD_SELECTOR)
+            first_text = await first_tip.inner_text() if first_tip else None
+            await next_page.click(timeout=10000)
+            # Espera a que el primer tip cambie en lugar de una pausa fija
+            await page.wait_for_function(
+                _PAGE_CHANGED_JS, arg={'el': first_tip, 'text': first_text, 'selector': _TIP_CARD_SELECTOR},
+                timeout=10000
+            )
+            return True
+        except Exception as e:
+            print(f"Error en paginación: {e}")
+            return False
+
+    async def _tips_capturados(self, tips_api: dict):
+        """
+        Devuelve el bloque 'tips' de la última respuesta de tips interceptada en la página.
+        Devuelve None si no se capturó ninguna o no se puede leer.
+        """
+        response = tips_api.get('response')
+        if response is None:
+            return None
+        try:
+            datos = await _leer_bloque_tips(response)
+        except Exception as e:
+            print(f"Error leyendo la respuesta de tips capturada: {e}")
+            return None
+        return datos
\ No newline at end of file
@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import orjson
+
+# model_users se ejecuta con su propia carpeta en el path (from config.settings import ...)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from config.settings import Settings
+from utils import helpers
+
+
+class TestCargarProgreso(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.progreso_path = os.path.join(self.tmp.name, "progreso.json")
+        self.log_path = os.path.join(self.tmp.name, "progreso.ndjson")
+        patcher = patch.multiple(
+            Settings, PROGRESO_PATH=self.progreso_path, PROGRESO_LOG_PATH=self.log_path
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(helpers._cerrar_log_progreso)
+
+    def _escribir_log(self, user_ids):
+        with open(self.log_path, "wb") as f:
+            for user_id in user_ids:
+                f.write(orjson.dumps(user_id) + b"\n")
+
+    def _leer_log(self):
+        with open(self.log_path, "rb") as f:
+            return [orjson.loads(linea) for linea in f if linea.strip()]
+
+    def test_sin_archivos(self):
+        self.assertIsNone(helpers.cargar_progreso())
+
+    def test_formato_anterior_se_migra_al_log(self):
+        with open(self.progreso_path, "wb") as f:
+            f.write(orjson.dumps({"idx_actual": 5, "processed_user_ids": ["a", "b"]}))
+        self._escribir_log(["c"])
+
+        progreso = helpers.cargar_progreso()
+        self.assertEqual(progreso["idx_actual"], 5)
+        self.assertEqual(progreso["processed_user_ids"], {"a", "b", "c"})
+        self.assertEqual(sorted(self._leer_log()), ["a", "b", "c"])
+
+    def test_log_con_repetidos_se_compacta(self):
+        self._escribir_log(["a", "a", "a", "b", "a"])
+
+        progreso = helpers.cargar_progreso()
+        self.assertEqual(progreso["processed_user_ids"], {"a", "b"})
+        self.assertEqual(sorted(self._leer_log()), ["a", "b"])
+
+    def test_log_sin_repetidos_no_se_reescribe(self):
+        self._escribir_log(["a", "b", "a"])
+        with patch.object(helpers, "_compactar_log_progreso") as compactar:
+            progreso = helpers.cargar_progreso()
+        compactar.assert_not_called()
+        self.assertEqual(progreso["processed_user_ids"], {"a", "b"})
+
+    def test_guardar_y_cargar(self):
+        helpers.registrar_usuario_procesado("x")
+        helpers.guardar_progreso(7, sync=True)
+
+        progreso = helpers.cargar_progreso()
+        self.assertEqual(progreso["idx_actual"], 7)
+        self.assertEqual(progreso["processed_user_ids"], {"x"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import sys
+import unittest
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+import orjson
+
+# model_users se ejecuta con su propia carpeta en el path (from config.settings import ...)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.user_reviews import _api_page_url, _plantilla_api_tips, _recorrer_api_tips, _tip_from_api
+
+API_URL = "https://es.foursquare.com/v2/users/123/tips?limit=2&offset=0&sort=recent"
+
+
+class FakeResponse:
+    def __init__(self, items=None, count=None, ok=True):
+        self.ok = ok
+        tips = {"items": items or []}
+        if count is not None:
+            tips["count"] = count
+        self._body = orjson.dumps({"response": {"tips": tips}})
+
+    async def body(self):
+        return self._body
+
+
+class FakeRequest:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.urls = []
+
+    async def get(self, url):
+        self.urls.append(url)
+        return self.responses.pop(0)
+
+
+def _query(url):
+    return parse_qs(urlsplit(url).query)
+
+
+class TestApiPageUrl(unittest.TestCase):
+    def test_offset_uses_tips_already_read(self):
+        url = _api_page_url(API_URL, 3, 5)
+        self.assertEqual(_query(url)["offset"], ["5"])
+        self.assertEqual(_query(url)["limit"], ["2"])
+        self.assertEqual(_query(url)["sort"], ["recent"])
+
+    def test_page_param(self):
+        url = _api_page_url("https://es.foursquare.com/v2/users/123/tips?page=1", 3, 40)
+        self.assertEqual(_query(url)["page"], ["3"])
+
+    def test_without_pagination_returns_none(self):
+        self.assertIsNone(_api_page_url("https://es.foursquare.com/v2/users/123/tips?limit=2", 2, 2))
+
+
+class TestPlantillaApiTips(unittest.TestCase):
+    def test_replaces_user_id_in_path(self):
+        plantilla = _plantilla_api_tips(API_URL, "123")
+        self.assertEqual(urlsplit(plantilla).path, "/v2/users/{user_id}/tips")
+        self.assertEqual(plantilla.replace("{user_id}", "456"), API_URL.replace("123", "456"))
+
+    def test_user_id_not_in_path(self):
+        self.assertIsNone(_plantilla_api_tips(API_URL, "999"))
+
+    def test_url_without_pagination(self):
+        self.assertIsNone(_plantilla_api_tips("https://es.foursquare.com/v2/users/123/tips", "123"))
+
+
+class TestRecorrerApiTips(unittest.IsolatedAsyncioTestCase):
+    async def test_pages_until_count(self):
+        request = FakeRequest([
+            FakeResponse([{"text": "a"}, {"text": "b"}], count=5),
+            FakeResponse([{"text": "c"}, {"text": "d"}], count=5),
+            FakeResponse([{"text": "e"}], count=5),
+        ])
+        tips = await _recorrer_api_tips(request, API_URL)
+        self.assertEqual([tip["comment"] for tip in tips], ["a", "b", "c", "d", "e"])
+        self.assertEqual([_query(url)["offset"] for url in request.urls], [["0"], ["2"], ["4"]])
+
+    async def test_first_block_is_not_requested_again(self):
+        primer_bloque = {"items": [{"text": "a"}, {"text": "b"}], "count": 3}
+        request = FakeRequest([FakeResponse([{"text": "c"}], count=3)])
+        tips = await _recorrer_api_tips(request, API_URL, primer_bloque)
+        self.assertEqual(len(tips), 3)
+        self.assertEqual(len(request.urls), 1)
+        self.assertEqual(_query(request.urls[0])["offset"], ["2"])
+
+    async def test_stops_on_empty_page(self):
+        request = FakeRequest([
+            FakeResponse([{"text": "a"}], count=10),
+            FakeResponse([], count=10),
+        ])
+        tips = await _recorrer_api_tips(request, API_URL)
+        self.assertEqual(len(tips), 1)
+
+    async def test_missing_count_returns_none(self):
+        request = FakeRequest([FakeResponse([{"text": "a"}])])
+        self.assertIsNone(await _recorrer_api_tips(request, API_URL))
+
+    async def test_failed_page_returns_none(self):
+        request = FakeRequest([
+            FakeResponse([{"text": "a"}, {"text": "b"}], count=4),
+            FakeResponse(ok=False),
+        ])
+        self.assertIsNone(await _recorrer_api_tips(request, API_URL))
+
+
+class TestTipFromApi(unittest.TestCase):
+    def test_fields(self):
+        tip = _tip_from_api({
+            "text": "Muy bueno",
+            "createdAt": 86399,
+            "venue": {
+                "name": "Café",
+                "rating": 8.5,
+                "categories": [{"name": "Cafetería"}],
+                "location": {"city": "Cartagena", "state": "Bolívar"},
+            },
+        })
+        self.assertEqual(tip["created_at"], "1970-01-01")
+        self.assertEqual(tip["venue_location"], "Cartagena, Bolívar")
+        self.assertEqual(tip["reviewed_category"], "Cafetería")
+        self.assertEqual(tip["score"], "8.5")
+        self.assertNotIn("date", tip)
+
+
+if __name__ == "__main__":
+    unittest.main()
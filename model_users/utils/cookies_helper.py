@@ -1,19 +1,24 @@
-import json
+import orjson
 import os
 from config.settings import Settings
 
 def guardar_cookies_playwright(page, cookies_path=Settings.COOKIES_PATH):
     cookies = page.context.cookies()
-    with open(cookies_path, "w", encoding="utf-8") as f:
-        json.dump(cookies, f, ensure_ascii=False, indent=4)
+    with open(cookies_path, "wb") as f:
+        f.write(orjson.dumps(cookies, option=orjson.OPT_INDENT_2))
     print(f"Cookies guardadas en {cookies_path}")
 
-def cargar_cookies_playwright(page, cookies_path=Settings.COOKIES_PATH):
+def leer_cookies(cookies_path=Settings.COOKIES_PATH):
     if not os.path.exists(cookies_path):
         print(f"No se encontró el archivo de cookies: {cookies_path}")
+        return None
+    with open(cookies_path, "rb") as f:
+        return orjson.loads(f.read())
+
+def cargar_cookies_playwright(page, cookies_path=Settings.COOKIES_PATH):
+    cookies = leer_cookies(cookies_path)
+    if cookies is None:
         return False
-    with open(cookies_path, "r", encoding="utf-8") as f:
-        cookies = json.load(f)
     page.context.add_cookies(cookies)
     print("Cookies cargadas correctamente.")
     return True
\ No newline at end of file
@@ -1,38 +1,113 @@
 import os
-import json
+import orjson
 from config.settings import Settings
 
-def guardar_progreso(idx_actual, processed_user_ids):
-    with open(Settings.PROGRESO_PATH, "w", encoding="utf-8") as f:
-        json.dump({"idx_actual": idx_actual, "processed_user_ids": list(processed_user_ids)}, f, ensure_ascii=False, indent=4)
+# Manejador abierto una sola vez para el log append-only de usuarios procesados
+_PROGRESO_LOG = None
+
+def _abrir_log_progreso():
+    global _PROGRESO_LOG
+    if _PROGRESO_LOG is None:
+        _PROGRESO_LOG = open(Settings.PROGRESO_LOG_PATH, "ab", buffering=Settings.NDJSON_BUFFER_SIZE)
+    return _PROGRESO_LOG
+
+def _cerrar_log_progreso():
+    global _PROGRESO_LOG
+    if _PROGRESO_LOG is not None:
+        _PROGRESO_LOG.close()
+        _PROGRESO_LOG = None
+
+def load_credentials(path):
+    """
+    Lee un archivo de credenciales con líneas clave=valor. Solo se separa en el primer '=',
+    así que los valores pueden contenerlo. Devuelve un dict vacío si el archivo no existe.
+    """
+    if not os.path.exists(path):
+        print(f"No se encontró el archivo de credenciales: {path}")
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return dict(line.strip().split("=", 1) for line in f if "=" in line)
+
+def registrar_usuario_procesado(user_id):
+    """
+    Añade un user_id al log de progreso (NDJSON, una línea por usuario).
+    La escritura queda en buffer hasta el siguiente guardar_progreso.
+    """
+    _abrir_log_progreso().write(orjson.dumps(user_id) + b"\n")
+
+def guardar_progreso(idx_actual, sync=False):
+    log = _abrir_log_progreso()
+    log.flush()
+    if sync:
+        os.fsync(log.fileno())
+    with open(Settings.PROGRESO_PATH, "wb") as f:
+        f.write(orjson.dumps({"idx_actual": idx_actual}))
     print(f"Progreso guardado en {Settings.PROGRESO_PATH}")
 
+def _compactar_log_progreso(processed_user_ids):
+    _cerrar_log_progreso()
+    tmp_path = Settings.PROGRESO_LOG_PATH + ".tmp"
+    with open(tmp_path, "wb") as f:
+        for user_id in processed_user_ids:
+            f.write(orjson.dumps(user_id) + b"\n")
+    os.replace(tmp_path, Settings.PROGRESO_LOG_PATH)
+    print(f"Log de progreso compactado: {len(processed_user_ids)} usuarios")
+
 def cargar_progreso():
+    """
+    Carga idx_actual del archivo de progreso y los usuarios procesados del log NDJSON.
+    Si el log tiene más del doble de líneas que usuarios únicos, se compacta.
+    """
+    progreso = None
     if os.path.exists(Settings.PROGRESO_PATH):
-        with open(Settings.PROGRESO_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return None
+        with open(Settings.PROGRESO_PATH, "rb") as f:
+            progreso = orjson.loads(f.read())
+    # Formato anterior: la lista completa de usuarios vivía en el archivo de progreso
+    legacy_ids = progreso.pop("processed_user_ids", []) if progreso else []
+    processed_user_ids = set(legacy_ids)
+    lineas = 0
+    if os.path.exists(Settings.PROGRESO_LOG_PATH):
+        with open(Settings.PROGRESO_LOG_PATH, "rb") as f:
+            for linea in f:
+                if linea.strip():
+                    processed_user_ids.add(orjson.loads(linea))
+                    lineas += 1
+    if legacy_ids or lineas > 2 * len(processed_user_ids):
+        _compactar_log_progreso(processed_user_ids)
+    if progreso is None and not processed_user_ids:
+        return None
+    progreso = progreso or {}
+    progreso["processed_user_ids"] = processed_user_ids
+    return progreso
+
+def _cargar_ids_error():
+    ids = set()
+    if os.path.exists(Settings.ERROR_TIPS_PATH):
+        with open(Settings.ERROR_TIPS_PATH, "rb") as f:
+            for linea in f:
+                if linea.strip():
+                    ids.add(orjson.loads(linea).get("user_id"))
+    return ids
+
+# user_ids ya registrados en el log de errores, leídos una sola vez al importar el módulo
+_ERROR_IDS = _cargar_ids_error()
 
 def save_log_error(info):
     """
-    Guarda la información del usuario en un solo archivo error_tips.json (lista de dicts).
+    Agrega la información del usuario a error_tips.ndjson (un registro por línea).
     """
-    os.makedirs(Settings.LOGS_ERROR_DIR, exist_ok=True)
-    if os.path.exists(Settings.ERROR_TIPS_PATH):
-        with open(Settings.ERROR_TIPS_PATH, "r", encoding="utf-8") as f:
-            usuarios = json.load(f)
-    else:
-        usuarios = []
-    user_id = info['url_usuario'].split('/')[-1]
-    if not any(u.get("user_id") == user_id for u in usuarios):
-        usuarios.append({
-            "nombre_usuario": info['nombre_usuario'],
-            "user_id": user_id,
-            "url_usuario": info['url_usuario'],
-            "error": "No se encontró el botón 'Ver todos los tips'"
-        })
-        with open(Settings.ERROR_TIPS_PATH, "w", encoding="utf-8") as f:
-            json.dump(usuarios, f, ensure_ascii=False, indent=4)
-        print(f"Usuario con error agregado a: {Settings.ERROR_TIPS_PATH}")
-    else:
-        print(f"Usuario {user_id} ya registrado en {Settings.ERROR_TIPS_PATH}")
\ No newline at end of file
+    user_id = info['user_id']
+    if user_id in _ERROR_IDS:
+        print(f"Usuario {user_id} ya registrado en {Settings.ERROR_TIPS_PATH}")
+        return
+    _ERROR_IDS.add(user_id)
+    # LOGS_ERROR_DIR ya existe: lo crea Settings.create_output_dirs al iniciar
+    registro = {
+        "nombre_usuario": info['nombre_usuario'],
+        "user_id": user_id,
+        "url_usuario": info['url_usuario'],
+        "error": "No se encontró el botón 'Ver todos los tips'"
+    }
+    with open(Settings.ERROR_TIPS_PATH, "ab") as f:
+        f.write(orjson.dumps(registro) + b"\n")
+    print(f"Usuario con error agregado a: {Settings.ERROR_TIPS_PATH}")
\ No newline at end of file